@@ -1,24 +1,46 @@
 from pymodbus.client import ModbusSerialClient
 
-client = ModbusSerialClient(
-    port='COM5', baudrate=115200,
-    parity='N', stopbits=1, bytesize=8,
-    timeout=0.5
-)
-
-if client.connect():
-    print("✅ 串口连接成功，开始扫描地址...\n")
-    for addr in range(1, 11):
-        client.unit_id = addr
-        try:
-            result = client.read_holding_registers(address=0x0000, count=2)
-            if hasattr(result, "registers"):
-                print(f"✅ 发现设备: 地址 {addr}, 寄存器={result.registers}")
-                break
-            else:
-                print(f"❌ 地址 {addr} 无响应")
-        except Exception:
-            pass
-    client.close()
-else:
+SCAN_TIMEOUT = 0.05     # 115200 下一帧往返只要几 ms，50 ms 足够
+SLOW_TIMEOUT = 0.5      # 快速扫描没找到时，用原来的长超时再扫一遍（兼容慢设备）
+
+
+def scan(timeout):
+    """
+    扫描地址 1~10，返回 (串口是否连接成功, 发现的设备 (地址, 寄存器) 或 None)
+    """
+    client = ModbusSerialClient(
+        port='COM5', baudrate=115200,
+        parity='N', stopbits=1, bytesize=8,
+        timeout=timeout
+    )
+
+    if not client.connect():
+        return False, None
+
+    print(f"✅ 串口连接成功，开始扫描地址（超时 {timeout * 1000:.0f} ms）...\n")
+    found = None
+    try:
+        for addr in range(1, 11):
+            client.unit_id = addr
+            try:
+                result = client.read_holding_registers(address=0x0000, count=2)
+                if hasattr(result, "registers"):
+                    print(f"✅ 发现设备: 地址 {addr}, 寄存器={result.registers}")
+                    found = (addr, result.registers)
+                    break
+                else:
+                    print(f"❌ 地址 {addr} 无响应")
+            except Exception:
+                pass
+    finally:
+        client.close()
+    return True, found
+
+
+ok, found = scan(SCAN_TIMEOUT)
+if ok and found is None:
+    print("\n⚠️ 未发现设备，改用长超时重扫\n")
+    ok, found = scan(SLOW_TIMEOUT)
+
+if not ok:
     print("❌ 串口连接失败")
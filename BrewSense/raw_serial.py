@@ -40,55 +40,104 @@
 #        print("Invalid / no response")
 #
 
+import functools
 import serial
+import struct
 import time
 
-def crc16_modbus(data: bytes) -> int:
+def _crc16_modbus_entry(b: int) -> int:
+    crc = b
+    for _ in range(8):
+        if crc & 1:
+            crc = (crc >> 1) ^ 0xA001
+        else:
+            crc >>= 1
+    return crc
+
+# 查表法：每字节一次查表，省去内层 8 次移位
+_CRC16_MODBUS_TABLE = tuple(_crc16_modbus_entry(b) for b in range(256))
+
+def _crc16_modbus_py(data: bytes) -> int:
+    table = _CRC16_MODBUS_TABLE
     crc = 0xFFFF
     for b in data:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
     return crc
 
+# 优先用 crcmod 的 C 实现，没装就用上面的查表版
+# （Modbus 帧只有几个字节，自编 C 动态库经 ctypes 调用的开销与纯 Python 查表相当，不值得单独维护）
+try:
+    import crcmod.predefined
+    crc16_modbus = crcmod.predefined.mkPredefinedCrcFun("modbus")
+except ImportError:
+    crc16_modbus = _crc16_modbus_py
+
 PORT = "COM5"      # ← 改成你的端口号
 BAUD = 115200
-REQ = bytes.fromhex("01 03 03 80 00 06 C4 64")  # 读角度+圈数+状态+速度
+
+@functools.lru_cache(maxsize=64)
+def build_request(unit: int, func: int, addr: int, count: int) -> bytes:
+    """组一帧 Modbus RTU 请求（含 CRC，低字节在前），相同参数只算一次"""
+    body = struct.pack(">BBHH", unit, func, addr, count)
+    return body + struct.pack("<H", crc16_modbus(body))
+
+REQ = build_request(0x01, 0x03, 0x0380, 6)  # 读角度+圈数+状态+速度 = 01 03 03 80 00 06 C4 64
+
+RESP_STRUCT = struct.Struct(">IiHh")  # 角度(u32) + 圈数(i32) + 状态(u16) + 速度(i16)
+_ANGLE_SCALE = 360.0 / 2097152        # 单圈 21 位分辨率
+_SPEED_SCALE = 600000.0 / 2097152
 
 def parse_response(resp: bytes):
     if len(resp) >= 17 and resp[0] == 1 and resp[1] == 3:
-        data = resp[3:-2]
-        # 角度(4B) + 圈数(4B) + 状态(2B) + 速度(2B)
-        angle = int.from_bytes(data[0:4], "big", signed=False)
-        turns = int.from_bytes(data[4:8], "big", signed=True)
-        status = int.from_bytes(data[8:10], "big", signed=False)
-        speed_raw = int.from_bytes(data[10:12], "big", signed=True)
+        angle, turns, status, speed_raw = RESP_STRUCT.unpack_from(resp, 3)
 
-        angle_deg = angle * 360 / 2097152       # 单圈 21 位分辨率
-        speed_rpm = speed_raw * 600000 / 2097152
+        angle_deg = angle * _ANGLE_SCALE
+        speed_rpm = speed_raw * _SPEED_SCALE
 
         print(f"Angle: {angle_deg:9.4f}°  |  Turns: {turns:5d}  |  "
               f"Speed: {speed_rpm:8.3f} rpm  |  Status: 0x{status:04X}")
         return True
     return False
 
+def read_frame(ser) -> bytes:
+    """按 Modbus 帧头里的长度字节读取一帧，不再靠固定 sleep + read(64) 等超时"""
+    head = ser.read(3)                  # 地址 + 功能码 + 字节数/异常码
+    if len(head) < 3:
+        return head
+    if head[1] & 0x80:                  # 异常响应：只剩 2 字节 CRC
+        return head + ser.read(2)
+    return head + ser.read(head[2] + 2)
+
 with serial.Serial(PORT, BAUD, bytesize=8, parity=serial.PARITY_NONE,
                    stopbits=serial.STOPBITS_ONE, timeout=0.2) as ser:
+    # POSIX 下打开 ASYNC_LOW_LATENCY，去掉 USB 转串口约 16 ms 的回传延迟
+    if hasattr(ser, "set_low_latency_mode"):
+        try:
+            ser.set_low_latency_mode(True)
+        except (OSError, ValueError):
+            pass
+
     print(f"Listening on {PORT} @ {BAUD} baud...")
+    resync = True                       # 首轮先清一次缓冲区
     while True:
-        ser.reset_input_buffer()
+        # 只在失步（超时 / 坏帧）后的下一轮发请求前清缓冲区，正常收发不必每轮清；
+        # 放在发请求前而不是出错当时，这样超时后才迟到的旧应答（落在 sleep 期间）也会被清掉
+        if resync:
+            ser.reset_input_buffer()
+            resync = False
+
         ser.write(REQ)
         ser.flush()
-        time.sleep(0.003)               # 帧间隔约 3 ms，说明书建议 350–1000 µs
-        resp = ser.read(64)
+        resp = read_frame(ser)
 
         if not resp:
             print("No response")
+            resync = True               # 应答可能稍后才到，不清掉会被下一轮当成新应答
         else:
             if not parse_response(resp):
                 print("Invalid / CRC error:", resp.hex(" "))
+                resync = True
+            elif ser.in_waiting:
+                ser.read(ser.in_waiting)    # 丢掉多余字节
 
-        time.sleep(0.1)                 # 读取周期 100 ms，可自行调整
+        time.sleep(0.1)                 # 显示刷新周期 100 ms，可自行调整（不影响单帧响应延迟）
@@ -1,7 +1,7 @@
 import serial
 import struct
 import keyboard
-import time
+import threading
 
 # ===============================
 # 配置串口
@@ -10,6 +10,7 @@ SERIAL_PORT = "COM5"   # 修改为你的 Arduino COM 口
 BAUD_RATE = 115200
 
 ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=0.1)
+ser_lock = threading.Lock()
 
 # ===============================
 # 控制参数
@@ -26,12 +27,14 @@ print(f"初始速度: {speed_hz} Hz\n")
 # 发送协议帧
 # BF | motorMask | directionMask | speedHz | durationMs
 # ===============================
+CMD_STRUCT = struct.Struct("<BBBii")
+
+
 def send_move(motor_id, direction, speed_hz, duration_ms):
     motorMask = (1 << motor_id)
     directionMask = (direction << motor_id)
 
-    packet = struct.pack(
-        "<BBBii",
+    packet = CMD_STRUCT.pack(
         0xBF,               # header
         motorMask,
         directionMask,
@@ -39,55 +42,56 @@ def send_move(motor_id, direction, speed_hz, duration_ms):
         int(duration_ms)
     )
 
-    ser.write(packet)
+    with ser_lock:                  # 回调可能并发触发
+        ser.write(packet)
     print(f"Motor {motor_id} Dir:{direction} Speed:{speed_hz}Hz Duration:{duration_ms}ms")
 
 
 # ===============================
-# 主循环：键盘事件监听
+# 键盘事件回调（由系统推送按键事件，不再轮询）
 # ===============================
-try:
-    while True:
-
-        # --- X 轴控制 ---
-        if keyboard.is_pressed('left'):
-            send_move(0, 0, speed_hz, move_duration_ms)
-            time.sleep(0.15)
+def speed_up(_event):
+    global speed_hz
+    speed_hz += 200
+    print(f"速度增加 → {speed_hz} Hz")
 
-        elif keyboard.is_pressed('right'):
-            send_move(0, 1, speed_hz, move_duration_ms)
-            time.sleep(0.15)
 
-        # --- Y 轴控制 ---
-        if keyboard.is_pressed('up'):
-            send_move(1, 1, speed_hz, move_duration_ms)
-            time.sleep(0.15)
+def speed_down(_event):
+    global speed_hz
+    speed_hz = max(200, speed_hz - 200)
+    print(f"速度减少 → {speed_hz} Hz")
 
-        elif keyboard.is_pressed('down'):
-            send_move(1, 0, speed_hz, move_duration_ms)
-            time.sleep(0.15)
 
-        # --- 速度增加 ---
-        if keyboard.is_pressed('+') or keyboard.is_pressed('='):
-            speed_hz += 200
-            print(f"速度增加 → {speed_hz} Hz")
-            time.sleep(0.2)
-
-        # --- 速度减少 ---
-        if keyboard.is_pressed('-'):
-            speed_hz = max(200, speed_hz - 200)
-            print(f"速度减少 → {speed_hz} Hz")
-            time.sleep(0.2)
+def bind_move(key, motor_id, direction):
+    keyboard.on_press_key(
+        key, lambda _event: send_move(motor_id, direction, speed_hz, move_duration_ms)
+    )
 
-        # --- ESC 退出 ---
-        if keyboard.is_pressed('esc'):
-            print("退出程序")
-            break
 
-        time.sleep(0.01)
+try:
+    # --- X 轴控制 ---
+    bind_move('left', 0, 0)
+    bind_move('right', 0, 1)
+
+    # --- Y 轴控制 ---
+    bind_move('up', 1, 1)
+    bind_move('down', 1, 0)
+
+    # --- 速度调整 ---
+    # '+'（Shift+=）解析扫描码时会去掉修饰键，与 '=' 落在同一个键上；
+    # 合并去重后每个扫描码只挂一次回调，否则按一次会加两次速
+    speed_up_codes = set(keyboard.key_to_scan_codes('+')) | set(keyboard.key_to_scan_codes('='))
+    for code in speed_up_codes:
+        keyboard.on_press_key(code, speed_up)
+    keyboard.on_press_key('-', speed_down)
+
+    # --- ESC 退出 ---
+    keyboard.wait('esc')
+    print("退出程序")
 
 except KeyboardInterrupt:
     print("退出程序（Ctrl+C）")
 
 finally:
+    keyboard.unhook_all()
     ser.close()
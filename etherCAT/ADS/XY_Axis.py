@@ -1,3 +1,6 @@
+import ctypes
+import contextlib
+import threading
 import time
 import pyads
 
@@ -12,62 +15,115 @@ PLC_IP     = "192.168.1.10"      # 可选，用于 Route
 plc = pyads.Connection(AMS_NET_ID, AMS_PORT, PLC_IP)
 plc.open()
 
+# -----------------------------
+# 变量句柄缓存
+# -----------------------------
+_handles = {}
+
+
+def var_handle(axis, var):
+    """按名字取一次句柄后缓存，之后的读写不再让 PLC 做符号解析"""
+    name = f"{axis}.{var}"
+    handle = _handles.get(name)
+    if handle is None:
+        handle = _handles[name] = plc.get_handle(name)
+    return handle
+
+
+def write_var(axis, var, value, plc_type):
+    plc.write_by_name("", value, plc_type, handle=var_handle(axis, var))
+
+
+def read_var(axis, var, plc_type):
+    return plc.read_by_name("", plc_type, handle=var_handle(axis, var))
+
+
+def release_handles():
+    for handle in _handles.values():
+        plc.release_handle(handle)
+    _handles.clear()
+
+
 # -----------------------------
 # 工具函数
 # -----------------------------
-def wait_until(expr, timeout=5.0, period=0.05):
-    t0 = time.time()
-    while time.time() - t0 < timeout:
-        if expr():
-            return True
-        time.sleep(period)
-    return False
+FLAG_TIMEOUT = 5.0   # 等待标志位变 TRUE 的超时（秒）
+
+
+@contextlib.contextmanager
+def watch_flag(name):
+    """
+    订阅 BOOL 变量的 ADS 通知（PLC 端变化即推送），变为 TRUE 时置位 Event。
+    with 块内得到该 Event；离开 with 块时（包括中途抛异常）一定注销通知。
+    """
+    event = threading.Event()
+
+    def on_change(notification, _name):
+        _, _, value = plc.parse_notification(notification, pyads.PLCTYPE_BOOL)
+        if value:
+            event.set()
+
+    attr = pyads.NotificationAttrib(ctypes.sizeof(pyads.PLCTYPE_BOOL))
+    handles = plc.add_device_notification(name, attr, on_change)
+    try:
+        yield event
+    finally:
+        plc.del_device_notification(*handles)
 
 
 def axis_enable(axis):
-    plc.write_by_name(f"{axis}.bEnable", True, pyads.PLCTYPE_BOOL)
-    ok = wait_until(lambda: plc.read_by_name(f"{axis}.bReady", pyads.PLCTYPE_BOOL))
+    with watch_flag(f"{axis}.bReady") as ready:
+        write_var(axis, "bEnable", True, pyads.PLCTYPE_BOOL)
+        ok = ready.wait(FLAG_TIMEOUT)
     print(f"[{axis}] Enable -> Ready:", ok)
     return ok
 
 
 def axis_reset(axis):
-    plc.write_by_name(f"{axis}.bReset", True, pyads.PLCTYPE_BOOL)
+    write_var(axis, "bReset", True, pyads.PLCTYPE_BOOL)
     time.sleep(0.1)
-    plc.write_by_name(f"{axis}.bReset", False, pyads.PLCTYPE_BOOL)
+    write_var(axis, "bReset", False, pyads.PLCTYPE_BOOL)
     print(f"[{axis}] Reset sent")
 
 
 def axis_move_abs(axis, pos, vel=50.0, acc=200.0, dec=200.0):
-    plc.write_by_name(f"{axis}.fPos", pos, pyads.PLCTYPE_LREAL)
-    plc.write_by_name(f"{axis}.fVel", vel, pyads.PLCTYPE_LREAL)
-    plc.write_by_name(f"{axis}.fAcc", acc, pyads.PLCTYPE_LREAL)
-    plc.write_by_name(f"{axis}.fDec", dec, pyads.PLCTYPE_LREAL)
+    # 4 个参数合成一次 ADS Sum 写，只走一次往返
+    plc.write_list_by_name({
+        f"{axis}.fPos": pos,
+        f"{axis}.fVel": vel,
+        f"{axis}.fAcc": acc,
+        f"{axis}.fDec": dec,
+    })
+
+    # 上升沿之前先订阅 bBusy，短行程也不会漏掉
+    with watch_flag(f"{axis}.bBusy") as busy:
+        write_var(axis, "bMoveAbs", True, pyads.PLCTYPE_BOOL)
+        time.sleep(0.05)
+        write_var(axis, "bMoveAbs", False, pyads.PLCTYPE_BOOL)
 
-    plc.write_by_name(f"{axis}.bMoveAbs", True, pyads.PLCTYPE_BOOL)
-    time.sleep(0.05)
-    plc.write_by_name(f"{axis}.bMoveAbs", False, pyads.PLCTYPE_BOOL)
+        print(f"[{axis}] MoveAbs -> {pos}")
 
-    print(f"[{axis}] MoveAbs -> {pos}")
+        busy.wait(FLAG_TIMEOUT)
 
-    wait_until(lambda: plc.read_by_name(f"{axis}.bBusy", pyads.PLCTYPE_BOOL))
-    wait_until(lambda: plc.read_by_name(f"{axis}.bDone", pyads.PLCTYPE_BOOL))
+    # bDone 在 Busy 之后再订阅，避免读到上一次运动残留的 Done
+    with watch_flag(f"{axis}.bDone") as done:
+        done.wait(FLAG_TIMEOUT)
 
-    act = plc.read_by_name(f"{axis}.fActPos", pyads.PLCTYPE_LREAL)
+    act = read_var(axis, "fActPos", pyads.PLCTYPE_LREAL)
     print(f"[{axis}] Done, ActPos = {act:.3f}")
 
 
 def axis_stop(axis):
-    plc.write_by_name(f"{axis}.bStop", True, pyads.PLCTYPE_BOOL)
+    write_var(axis, "bStop", True, pyads.PLCTYPE_BOOL)
     time.sleep(0.1)
-    plc.write_by_name(f"{axis}.bStop", False, pyads.PLCTYPE_BOOL)
+    write_var(axis, "bStop", False, pyads.PLCTYPE_BOOL)
     print(f"[{axis}] Stop sent")
 
 
 def axis_check_error(axis):
-    err = plc.read_by_name(f"{axis}.bError", pyads.PLCTYPE_BOOL)
+    err = read_var(axis, "bError", pyads.PLCTYPE_BOOL)
     if err:
-        code = plc.read_by_name(f"{axis}.nErrorID", pyads.PLCTYPE_UDINT)
+        code = read_var(axis, "nErrorID", pyads.PLCTYPE_UDINT)
         print(f"[{axis}] ERROR! Code = {code}")
     return err
 
@@ -91,4 +147,5 @@ except KeyboardInterrupt:
     axis_stop("gAxisCmd_Y")
 
 finally:
+    release_handles()
     plc.close()
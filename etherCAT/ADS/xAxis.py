@@ -25,10 +25,15 @@ plc.write_by_name("gAxisCmd_X.bMoveAbs", True, pyads.PLCTYPE_BOOL)
 time.sleep(0.05)   # 不需要精确，> 1 scan 即可
 plc.write_by_name("gAxisCmd_X.bMoveAbs", False, pyads.PLCTYPE_BOOL)
 
+# 轮询用的变量先取句柄，循环里不再按名字解析
+h_busy = plc.get_handle("gAxisCmd_X.bBusy")
+h_done = plc.get_handle("gAxisCmd_X.bDone")
+h_pos  = plc.get_handle("gAxisCmd_X.fActPos")
+
 while True:
-    busy = plc.read_by_name("gAxisCmd_X.bBusy", pyads.PLCTYPE_BOOL)
-    done = plc.read_by_name("gAxisCmd_X.bDone", pyads.PLCTYPE_BOOL)
-    pos  = plc.read_by_name("gAxisCmd_X.fActPos", pyads.PLCTYPE_LREAL)
+    busy = plc.read_by_name("", pyads.PLCTYPE_BOOL, handle=h_busy)
+    done = plc.read_by_name("", pyads.PLCTYPE_BOOL, handle=h_done)
+    pos  = plc.read_by_name("", pyads.PLCTYPE_LREAL, handle=h_pos)
 
     print(f"Busy={busy}, Done={done}, Pos={pos:.3f}")
 
@@ -37,6 +42,9 @@ while True:
 
     time.sleep(0.1)
 
+for h in (h_busy, h_done, h_pos):
+    plc.release_handle(h)
+
 err = plc.read_by_name("gAxisCmd_X.bError", pyads.PLCTYPE_BOOL)
 if err:
     err_id = plc.read_by_name("gAxisCmd_X.nErrorID", pyads.PLCTYPE_UDINT)
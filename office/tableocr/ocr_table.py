@@ -1,34 +1,38 @@
 import os
 import csv
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from paddleocr import PaddleOCR
 
 # 降低 Paddle 日志噪音（可选）
 os.environ["FLAGS_log_level"] = "3"
 
-# ===== OCR 初始化（新 pipeline 唯一安全写法）=====
-ocr = PaddleOCR(
-    lang='ch',
-    use_textline_orientation=True
-)
-
 image_dir = "tables"
 out_dir = "ocr_out"
-os.makedirs(out_dir, exist_ok=True)
 
+# 每个工作进程各自持有一个 OCR 实例（PaddleOCR 对象不能 pickle）
+ocr = None
 
-def y_center(poly):
-    return sum(p[1] for p in poly) / len(poly)
 
+def _init_ocr():
+    # ===== OCR 初始化（新 pipeline 唯一安全写法）=====
+    global ocr
+    ocr = PaddleOCR(
+        lang='ch',
+        use_textline_orientation=True
+    )
 
-def x_center(poly):
-    return sum(p[0] for p in poly) / len(poly)
 
+def poly_centers(polys):
+    """所有检测框的中心点，一次 numpy 计算，返回 (N, 2)：x, y"""
+    if len(polys) == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.asarray(polys, dtype=np.float64).mean(axis=1)
 
-for fname in os.listdir(image_dir):
-    if not fname.lower().endswith((".png", ".jpg", ".jpeg")):
-        continue
 
-    print(f"\n==== OCR {fname} ====")
+def process_one(fname):
+    """识别一张图片并写出 CSV，返回要打印的日志（子进程里直接 print 会交错）"""
+    log = f"\n==== OCR {fname} ===="
 
     img_path = os.path.join(image_dir, fname)
 
@@ -36,8 +40,7 @@ for fname in os.listdir(image_dir):
     result = ocr.predict(img_path)
 
     if not result:
-        print("⚠️ no result")
-        continue
+        return log + "\n⚠️ no result"
 
     res = result[0]
 
@@ -45,28 +48,37 @@ for fname in os.listdir(image_dir):
     scores = res.get("rec_scores", [])
     polys = res.get("dt_polys", [])
 
-    rows = []
-    for text, score, poly in zip(texts, scores, polys):
-        rows.append({
-            "text": text.strip(),
-            "score": score,
-            "x": x_center(poly),
-            "y": y_center(poly)
-        })
+    centers = poly_centers(polys)
+    n = min(len(texts), len(scores), len(centers))
+    xs = centers[:n, 0]
+    ys = centers[:n, 1]
 
-    # 表格排序：先 y 后 x
-    rows.sort(key=lambda r: (round(r["y"] / 10), r["x"]))
+    # 表格排序：先 y（按 10 px 分行）后 x，lexsort 以最后一个键为主键
+    order = np.lexsort((xs, np.round(ys / 10).astype(np.int64)))
 
     out_csv = os.path.join(out_dir, fname + ".csv")
     with open(out_csv, "w", newline="", encoding="utf-8-sig") as f:
         writer = csv.writer(f)
         writer.writerow(["text", "x", "y", "score"])
-        for r in rows:
+        for i in order:
             writer.writerow([
-                r["text"],
-                f"{r['x']:.1f}",
-                f"{r['y']:.1f}",
-                f"{r['score']:.3f}"
+                texts[i].strip(),
+                f"{xs[i]:.1f}",
+                f"{ys[i]:.1f}",
+                f"{scores[i]:.3f}"
             ])
 
-    print(f"→ saved {out_csv}")
+    return log + f"\n→ saved {out_csv}"
+
+
+if __name__ == "__main__":
+    os.makedirs(out_dir, exist_ok=True)
+
+    fnames = [
+        fname for fname in os.listdir(image_dir)
+        if fname.lower().endswith((".png", ".jpg", ".jpeg"))
+    ]
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_ocr) as ex:
+        for log in ex.map(process_one, fnames):
+            print(log)
@@ -1,5 +1,7 @@
+import csv
 import math
-import pandas as pd
+from functools import lru_cache
+import numpy as np
 
 # ============================================================
 # Configuration
@@ -13,6 +15,16 @@ W_FREQ = 1.0      # frequency error weight
 W_WRAP = 0.005     # wrap penalty weight (tunable)
 
 OUT_CSV = "pwm_div_error_compare_scored.csv"
+FIELDNAMES = [
+    "target_hz",
+    "old_div", "old_wrap", "old_real_hz", "old_err_ppm",
+    "window_div", "window_wrap", "window_real_hz", "window_err_ppm",
+    "scored_div", "scored_wrap", "scored_real_hz", "scored_err_ppm",
+]
+PREVIEW_ROWS = 20
+
+# all legal 8.4 fixed-point dividers: 1.0, 1.0625, ..., 256.0
+DIV_CANDIDATES = np.arange(16, 256 * 16 + 1, dtype=np.float64) / 16.0
 
 # ============================================================
 # Frequency sweep
@@ -44,6 +56,7 @@ def compute_real_freq(sys_hz, freq_hz, div):
 # Old choose_clk_div (legal only)
 # ============================================================
 
+@lru_cache(maxsize=4096)
 def choose_div_old(sys_hz, freq_hz):
     if freq_hz == 0:
         return 1.0
@@ -54,112 +67,111 @@ def choose_div_old(sys_hz, freq_hz):
 # New (hard wrap window)
 # ============================================================
 
+@lru_cache(maxsize=4096)
 def choose_div_window(sys_hz, freq_hz):
-    best_div = None
-    best_err = float("inf")
-
-    for i in range(16, 256 * 16 + 1):
-        div = i / 16.0
-        wrap_f = sys_hz / (div * freq_hz) - 1.0
-        if wrap_f < WRAP_MIN or wrap_f > WRAP_MAX:
-            continue
-
-        wrap = int(wrap_f + 0.5)
-        real = sys_hz / (div * (wrap + 1))
-        err = abs(real - freq_hz)
-
-        if err < best_err:
-            best_err = err
-            best_div = div
-
-    if best_div is None:
+    divs = DIV_CANDIDATES
+    wrap_f = sys_hz / (divs * freq_hz) - 1.0
+    legal = (wrap_f >= WRAP_MIN) & (wrap_f <= WRAP_MAX)
+    if not legal.any():
         return choose_div_old(sys_hz, freq_hz)
 
-    return best_div
+    wrap = (wrap_f + 0.5).astype(np.int64)
+    real = sys_hz / (divs * (wrap + 1))
+    err = np.abs(real - freq_hz)
+    err[~legal] = np.inf
+
+    # argmin returns the first minimum -> same tie-break as the old loop
+    return float(divs[np.argmin(err)])
 
 # ============================================================
 # Layered scoring version (RECOMMENDED)
 # ============================================================
 
 def wrap_penalty(wrap):
-    if WRAP_MIN <= wrap <= WRAP_MAX:
-        return 0.0
-    if wrap < WRAP_MIN:
-        return (WRAP_MIN - wrap) / WRAP_MIN
-    return (wrap - WRAP_MAX) / WRAP_MAX
-
+    """Works on a scalar or a numpy array of wraps."""
+    wrap = np.asarray(wrap, dtype=np.float64)
+    return np.where(
+        wrap < WRAP_MIN,
+        (WRAP_MIN - wrap) / WRAP_MIN,
+        np.where(wrap > WRAP_MAX, (wrap - WRAP_MAX) / WRAP_MAX, 0.0),
+    )
+
+@lru_cache(maxsize=4096)
 def choose_div_scored(sys_hz, freq_hz):
-    best_div = None
-    best_score = float("inf")
-
-    for i in range(16, 256 * 16 + 1):
-        div = i / 16.0
-        wrap_f = sys_hz / (div * freq_hz) - 1.0
-        if wrap_f < 2 or wrap_f > 65535:
-            continue
-
-        wrap = int(wrap_f + 0.5)
-        real = sys_hz / (div * (wrap + 1))
-
-        freq_err_norm = abs(real - freq_hz) / freq_hz
-        score = (
-            W_FREQ * freq_err_norm +
-            W_WRAP * wrap_penalty(wrap)
-        )
+    divs = DIV_CANDIDATES
+    wrap_f = sys_hz / (divs * freq_hz) - 1.0
+    legal = (wrap_f >= 2) & (wrap_f <= 65535)
+    if not legal.any():
+        return choose_div_old(sys_hz, freq_hz)
 
-        if score < best_score:
-            best_score = score
-            best_div = div
+    wrap = (wrap_f + 0.5).astype(np.int64)
+    real = sys_hz / (divs * (wrap + 1))
 
-    if best_div is None:
-        return choose_div_old(sys_hz, freq_hz)
+    freq_err_norm = np.abs(real - freq_hz) / freq_hz
+    score = (
+        W_FREQ * freq_err_norm +
+        W_WRAP * wrap_penalty(wrap)
+    )
+    score[~legal] = np.inf
 
-    return best_div
+    return float(divs[np.argmin(score)])
 
 # ============================================================
 # Main
 # ============================================================
 
 def main():
-    rows = []
-
-    for freq in make_freq_list():
-        # old
-        d_old = choose_div_old(CLK_SYS_HZ, freq)
-        w_old, r_old = compute_real_freq(CLK_SYS_HZ, freq, d_old)
-
-        # window
-        d_win = choose_div_window(CLK_SYS_HZ, freq)
-        w_win, r_win = compute_real_freq(CLK_SYS_HZ, freq, d_win)
-
-        # scored
-        d_sc = choose_div_scored(CLK_SYS_HZ, freq)
-        w_sc, r_sc = compute_real_freq(CLK_SYS_HZ, freq, d_sc)
-
-        rows.append({
-            "target_hz": freq,
-
-            "old_div": d_old,
-            "old_wrap": w_old,
-            "old_real_hz": r_old,
-            "old_err_ppm": abs(r_old - freq) / freq * 1e6,
-
-            "window_div": d_win,
-            "window_wrap": w_win,
-            "window_real_hz": r_win,
-            "window_err_ppm": abs(r_win - freq) / freq * 1e6,
-
-            "scored_div": d_sc,
-            "scored_wrap": w_sc,
-            "scored_real_hz": r_sc,
-            "scored_err_ppm": abs(r_sc - freq) / freq * 1e6,
-        })
-
-    df = pd.DataFrame(rows)
-    df.to_csv(OUT_CSV, index=False)
+    preview = []
+
+    with open(OUT_CSV, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+
+        for freq in make_freq_list():
+            # old
+            d_old = choose_div_old(CLK_SYS_HZ, freq)
+            w_old, r_old = compute_real_freq(CLK_SYS_HZ, freq, d_old)
+
+            # window
+            d_win = choose_div_window(CLK_SYS_HZ, freq)
+            w_win, r_win = compute_real_freq(CLK_SYS_HZ, freq, d_win)
+
+            # scored
+            d_sc = choose_div_scored(CLK_SYS_HZ, freq)
+            w_sc, r_sc = compute_real_freq(CLK_SYS_HZ, freq, d_sc)
+
+            row = {
+                "target_hz": freq,
+
+                "old_div": d_old,
+                "old_wrap": w_old,
+                "old_real_hz": r_old,
+                "old_err_ppm": abs(r_old - freq) / freq * 1e6,
+
+                "window_div": d_win,
+                "window_wrap": w_win,
+                "window_real_hz": r_win,
+                "window_err_ppm": abs(r_win - freq) / freq * 1e6,
+
+                "scored_div": d_sc,
+                "scored_wrap": w_sc,
+                "scored_real_hz": r_sc,
+                "scored_err_ppm": abs(r_sc - freq) / freq * 1e6,
+            }
+            writer.writerow(row)
+            if len(preview) < PREVIEW_ROWS:
+                preview.append(row)
 
     print(f"[OK] exported: {OUT_CSV}")
-    print(df.head(20))
+    # 预览前 PREVIEW_ROWS 行的全部列（与 CSV 相同），浮点保留 4 位小数（div 步长 1/16）
+    widths = [max(len(name), 12) for name in FIELDNAMES]
+    print(" ".join(f"{name:>{w}}" for name, w in zip(FIELDNAMES, widths)))
+    for row in preview:
+        cells = []
+        for name, w in zip(FIELDNAMES, widths):
+            v = row[name]
+            cells.append(f"{v:>{w}}" if isinstance(v, int) else f"{v:>{w}.4f}")
+        print(" ".join(cells))
 
 if __name__ == "__main__":
     main()
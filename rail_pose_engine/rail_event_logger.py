@@ -15,11 +15,14 @@ from typing import BinaryIO
 
 
 class RailEventLogger:
-    def __init__(self, path: str | Path, *, use_monotonic: bool = True):
+    def __init__(self, path: str | Path, *, use_monotonic: bool = True, flush_every: int = 32):
         self.path = Path(path)
         self.use_monotonic = use_monotonic
+        # rows buffered before an automatic flush (1 -> flush every row)
+        self.flush_every = max(1, int(flush_every))
         self._file: BinaryIO | None = None
         self._writer: csv.writer | None = None
+        self._pending = 0
 
     def open(self):
         self.path.parent.mkdir(parents=True, exist_ok=True)
@@ -30,6 +33,13 @@ class RailEventLogger:
         if self.path.stat().st_size == 0:
             self._writer.writerow(["t_send_abs", "packet_hex"])
             self._file.flush()
+        self._pending = 0
+
+    def flush(self):
+        """Push buffered rows to disk."""
+        if self._file:
+            self._file.flush()
+        self._pending = 0
 
     def close(self):
         if self._file:
@@ -37,6 +47,7 @@ class RailEventLogger:
             self._file.close()
         self._file = None
         self._writer = None
+        self._pending = 0
 
     def log_packet(self, raw_packet: bytes):
         if self._writer is None:
@@ -45,8 +56,11 @@ class RailEventLogger:
         t = time.monotonic() if self.use_monotonic else time.time()
         hex_str = raw_packet.hex()
 
-        self._writer.writerow([f"{t:.9f}", hex_str])
-        self._file.flush()
+        self._file.write(f"{t:.9f},{hex_str}\r\n")
+
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
 
     def __enter__(self):
         self.open()
@@ -16,18 +16,39 @@ Author: (project internal)
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
 from pathlib import Path
-import csv
 import struct
 from typing import List, Optional, Tuple, Iterable, Dict
 
+import numpy as np
+
+
+# 0xBF frame: header, motorMask, directionMask, speedHz, durationMs
+_BF_STRUCT = struct.Struct("<BBBii")
+# same layout as a numpy record, for parsing many frames at once
+_BF_DTYPE = np.dtype([
+    ("header", "u1"),
+    ("motor_mask", "u1"),
+    ("direction_mask", "u1"),
+    ("speed_hz", "<i4"),
+    ("duration_ms", "<i4"),
+])
+
+# motorMask bits
+_MOTOR_X = 0b00000001  # motor0 -> X axis
+_MOTOR_Y = 0b00000010  # motor1 -> Y axis
+
+# max entries in the optional pose_at() cache (new times are not cached once full)
+_POSE_CACHE_SIZE = 4096
+
 
 # ============================================================
 # Data structures
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class BFCommand:
     """Parsed 0xBF command."""
     t_send_abs: float      # absolute time (monotonic or wall clock), as provided
@@ -38,7 +59,7 @@ class BFCommand:
     duration_ms: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Segment:
     """
     A piecewise-constant velocity segment for one axis (X or Y).
@@ -58,6 +79,203 @@ class Segment:
         return self.p0 + self.v * (t - self.t0)
 
 
+class SegmentArray:
+    """
+    Columnar (SoA) storage of one axis' segments: t0[], t1[], v[], p0[],
+    plus the cached end position p1[] = p0 + v * (t1 - t0).
+
+    This is the engine's segment store. Columns are contiguous float64 buffers,
+    so a whole array of times is evaluated in one numpy pass. Segments must be
+    appended in t0 order (truncate() keeps that invariant for overwrites).
+    """
+
+    def __init__(self, capacity: int = 16):
+        capacity = max(1, int(capacity))
+        self._t0 = np.empty(capacity, dtype=np.float64)
+        self._t1 = np.empty(capacity, dtype=np.float64)
+        self._v = np.empty(capacity, dtype=np.float64)
+        self._p0 = np.empty(capacity, dtype=np.float64)
+        self._p1 = np.empty(capacity, dtype=np.float64)
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def t0(self) -> np.ndarray:
+        return self._t0[:self._n]
+
+    @property
+    def t1(self) -> np.ndarray:
+        return self._t1[:self._n]
+
+    @property
+    def v(self) -> np.ndarray:
+        return self._v[:self._n]
+
+    @property
+    def p0(self) -> np.ndarray:
+        return self._p0[:self._n]
+
+    @property
+    def p1(self) -> np.ndarray:
+        return self._p1[:self._n]
+
+    def _grow(self, min_capacity: int = 0) -> None:
+        """Double capacity (amortized O(1) append)."""
+        cap = max(2 * len(self._t0), min_capacity)
+        for name in ("_t0", "_t1", "_v", "_p0", "_p1"):
+            old = getattr(self, name)
+            new = np.empty(cap, dtype=np.float64)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def append(self, t0: float, t1: float, v: float, p0: float) -> None:
+        if self._n == len(self._t0):
+            self._grow()
+        i = self._n
+        self._t0[i] = t0
+        self._t1[i] = t1
+        self._v[i] = v
+        self._p0[i] = p0
+        self._p1[i] = p0 + v * (t1 - t0)
+        self._n = i + 1
+
+    def extend(self, t0: np.ndarray, t1: np.ndarray, v: np.ndarray, p0: np.ndarray, p1: np.ndarray) -> None:
+        """Append many segments at once (columns already resolved, in t0 order)."""
+        k = len(t0)
+        if self._n + k > len(self._t0):
+            self._grow(self._n + k)
+        i, j = self._n, self._n + k
+        self._t0[i:j] = t0
+        self._t1[i:j] = t1
+        self._v[i:j] = v
+        self._p0[i:j] = p0
+        self._p1[i:j] = p1
+        self._n = j
+
+    def truncate(self, t_new: float) -> None:
+        """
+        Overwrite semantics: cut the last segment at t_new if it extends beyond it.
+        Segments starting after t_new (out-of-order feed) are dropped.
+        """
+        n = self._n
+        while n and t_new < self._t0[n - 1]:
+            n -= 1
+        self._n = n
+        if n and t_new < self._t1[n - 1]:
+            i = n - 1
+            self._t1[i] = t_new  # immediate cut (zero-length if t_new == t0)
+            self._p1[i] = self._p0[i] + self._v[i] * (t_new - self._t0[i])
+
+    def rows(self) -> List[Tuple[float, float, float, float]]:
+        """[(t0, t1, v, p0), ...] as Python floats."""
+        return list(zip(self.t0.tolist(), self.t1.tolist(), self.v.tolist(), self.p0.tolist()))
+
+    def tail(self, p_init: float) -> float:
+        """End position of the last segment (p_init if empty)."""
+        n = self._n
+        return self._p1.item(n - 1) if n else p_init
+
+    def value_at(self, t: float, p_init: float) -> float:
+        """Scalar pos_at: O(log N) bisect, then O(1) from the segment's columns."""
+        i = bisect_right(self._t0, t, 0, self._n) - 1
+        if i < 0:
+            return p_init
+        if t >= self._t1.item(i):
+            return self._p1.item(i)  # past the end: cached end position
+        return self._p0.item(i) + self._v.item(i) * (t - self._t0.item(i))
+
+    def pos_at(self, t, p_init: float) -> np.ndarray:
+        """
+        Position at time(s) t (scalar or array), clamped like Segment.pos_at.
+        Times before the first segment give p_init; times in a gap give the
+        end position of the previous segment.
+        """
+        t = np.asarray(t, dtype=np.float64)
+        if self._n == 0:
+            return np.full(t.shape, p_init, dtype=np.float64)
+
+        idx = np.searchsorted(self.t0, t, side="right") - 1
+        i = np.maximum(idx, 0)
+        pos = self._p0[i] + self._v[i] * (np.minimum(t, self._t1[i]) - self._t0[i])
+        return np.where(idx < 0, p_init, pos)
+
+
+class CommandLog:
+    """
+    Columnar (SoA) log of parsed 0xBF commands, same fields as BFCommand.
+
+    Avoids one Python object per command; BFCommand rows are only built
+    when rows() is asked for. Columns grow by doubling like SegmentArray.
+    """
+
+    _COLUMNS = (
+        ("_t_send_abs", np.float64),
+        ("_t_rel", np.float64),
+        ("_motor_mask", np.uint8),
+        ("_direction_mask", np.uint8),
+        ("_speed_hz", np.int32),
+        ("_duration_ms", np.int32),
+    )
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(1, int(capacity))
+        for name, dtype in self._COLUMNS:
+            setattr(self, name, np.empty(capacity, dtype=dtype))
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def t_rel(self) -> np.ndarray:
+        return self._t_rel[:self._n]
+
+    @property
+    def duration_ms(self) -> np.ndarray:
+        return self._duration_ms[:self._n]
+
+    def _grow(self, min_capacity: int = 0) -> None:
+        cap = max(2 * len(self._t_rel), min_capacity)
+        for name, dtype in self._COLUMNS:
+            old = getattr(self, name)
+            new = np.empty(cap, dtype=dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def append(self, cmd: BFCommand) -> None:
+        if self._n == len(self._t_rel):
+            self._grow()
+        i = self._n
+        self._t_send_abs[i] = cmd.t_send_abs
+        self._t_rel[i] = cmd.t_rel
+        self._motor_mask[i] = cmd.motor_mask
+        self._direction_mask[i] = cmd.direction_mask
+        self._speed_hz[i] = cmd.speed_hz
+        self._duration_ms[i] = cmd.duration_ms
+        self._n = i + 1
+
+    def extend(self, t_send_abs, t_rel, motor_mask, direction_mask, speed_hz, duration_ms) -> None:
+        """Append many commands given as columns."""
+        k = len(t_rel)
+        if self._n + k > len(self._t_rel):
+            self._grow(self._n + k)
+        i, j = self._n, self._n + k
+        self._t_send_abs[i:j] = t_send_abs
+        self._t_rel[i:j] = t_rel
+        self._motor_mask[i:j] = motor_mask
+        self._direction_mask[i:j] = direction_mask
+        self._speed_hz[i:j] = speed_hz
+        self._duration_ms[i:j] = duration_ms
+        self._n = j
+
+    def rows(self) -> List[BFCommand]:
+        """Materialize the log as BFCommand objects (Python ints/floats)."""
+        n = self._n
+        return list(map(BFCommand, *(getattr(self, name)[:n].tolist() for name, _ in self._COLUMNS)))
+
+
 # ============================================================
 # Engine
 # ============================================================
@@ -80,7 +298,7 @@ class RailPoseEngine:
       direction bit = 1 -> -axis
     """
 
-    BF_STRUCT = struct.Struct("<BBBii")  # header, motorMask, directionMask, speedHz, durationMs
+    BF_STRUCT = _BF_STRUCT  # header, motorMask, directionMask, speedHz, durationMs
 
     def __init__(
         self,
@@ -91,13 +309,16 @@ class RailPoseEngine:
         # direction bit -> sign mapping
         dir_bit0_sign: int = +1,   # directionBit==0
         dir_bit1_sign: int = -1,   # directionBit==1
+        # memoize pose_at() per exact t_rel (cleared whenever the trajectory changes)
+        enable_pose_cache: bool = False,
     ):
         self.step_x_m = float(step_x_m)
         self.step_y_m = float(step_y_m)
         self.z_m = float(z_m)
 
-        self.dir_bit0_sign = int(dir_bit0_sign)
-        self.dir_bit1_sign = int(dir_bit1_sign)
+        self._dir_bit0_sign = int(dir_bit0_sign)
+        self._dir_bit1_sign = int(dir_bit1_sign)
+        self._rebuild_dir_sign_lut()
 
         # session time base
         self._started = False
@@ -107,12 +328,16 @@ class RailPoseEngine:
         self._x0_step = 0.0
         self._y0_step = 0.0
 
-        # segment lists (time-ordered, non-overlapping by construction)
-        self._x_segments: List[Segment] = []
-        self._y_segments: List[Segment] = []
+        # per-axis segments (time-ordered, non-overlapping by construction)
+        self._x_segments = SegmentArray()
+        self._y_segments = SegmentArray()
 
         # raw parsed commands log (optional but useful for debug/export)
-        self._cmd_log: List[BFCommand] = []
+        self._cmd_log = CommandLog()
+
+        # optional pose_at() memo, for callers that query the same times repeatedly
+        # (plain dict keyed on float t_rel: no reference back to the engine, so no cycle)
+        self._pose_cache: Optional[Dict[float, Tuple[float, float]]] = {} if enable_pose_cache else None
 
     # --------------------------
     # Session control
@@ -139,6 +364,7 @@ class RailPoseEngine:
         """
         self._x0_step = float(x0_step)
         self._y0_step = float(y0_step)
+        self._invalidate_pose_cache()
 
     # --------------------------
     # Parsing / direction
@@ -153,27 +379,48 @@ class RailPoseEngine:
 
     def _to_rel_time(self, t_send_abs: float) -> float:
         self._ensure_time_base(t_send_abs)
-        return float(t_send_abs) - float(self._t0_abs)
+        return t_send_abs - self._t0_abs
 
     def _parse_bf(self, raw_packet: bytes, t_send_abs: float) -> Optional[BFCommand]:
         if raw_packet is None:
             return None
-        if len(raw_packet) != self.BF_STRUCT.size:
+        bf = _BF_STRUCT
+        if len(raw_packet) != bf.size:
             return None
-        header, motor_mask, direction_mask, speed_hz, duration_ms = self.BF_STRUCT.unpack(raw_packet)
+        header, motor_mask, direction_mask, speed_hz, duration_ms = bf.unpack_from(raw_packet, 0)
         if header != 0xBF:
             return None
         if speed_hz < 0 or duration_ms < 0:
             return None
 
+        t_send_abs = float(t_send_abs)  # the one coercion; struct already returns ints
         t_rel = self._to_rel_time(t_send_abs)
-        return BFCommand(
-            t_send_abs=float(t_send_abs),
-            t_rel=float(t_rel),
-            motor_mask=int(motor_mask),
-            direction_mask=int(direction_mask),
-            speed_hz=int(speed_hz),
-            duration_ms=int(duration_ms),
+        return BFCommand(t_send_abs, t_rel, motor_mask, direction_mask, speed_hz, duration_ms)
+
+    @property
+    def dir_bit0_sign(self) -> int:
+        """Axis sign for directionBit==0. Assigning it applies to later commands."""
+        return self._dir_bit0_sign
+
+    @dir_bit0_sign.setter
+    def dir_bit0_sign(self, sign: int) -> None:
+        self._dir_bit0_sign = int(sign)
+        self._rebuild_dir_sign_lut()
+
+    @property
+    def dir_bit1_sign(self) -> int:
+        """Axis sign for directionBit==1. Assigning it applies to later commands."""
+        return self._dir_bit1_sign
+
+    @dir_bit1_sign.setter
+    def dir_bit1_sign(self, sign: int) -> None:
+        self._dir_bit1_sign = int(sign)
+        self._rebuild_dir_sign_lut()
+
+    def _rebuild_dir_sign_lut(self) -> None:
+        # directionMask -> (sign motor0, sign motor1), one lookup per command
+        self._dir_sign_lut: Tuple[Tuple[int, int], ...] = tuple(
+            (self._dir_sign(m, 0), self._dir_sign(m, 1)) for m in range(256)
         )
 
     def _dir_sign(self, direction_mask: int, motor_idx: int) -> int:
@@ -185,53 +432,38 @@ class RailPoseEngine:
     # --------------------------
 
     @staticmethod
-    def _pos_at_with_segments(segments: List[Segment], t: float, p_init: float) -> float:
+    def _pos_at_with_segments(segments: SegmentArray, t: float, p_init: float) -> float:
         """
         Compute position for one axis at time t from the piecewise segments.
         segments are time-ordered, non-overlapping.
-        """
-        if not segments:
-            return p_init
 
-        # Fast path: if t is before first segment
-        if t <= segments[0].t0:
-            return p_init
+        O(log N): bisect for the last segment starting at or before t. Its p0
+        already carries the accumulated position of everything before it.
+        """
+        return segments.value_at(t, p_init)
 
-        # Walk segments (segments are usually not huge; keep simple & robust)
-        p = p_init
-        for seg in segments:
-            if t < seg.t0:
-                break
-            if t <= seg.t1:
-                return seg.pos_at(t)
-            # t beyond this segment, accumulate fully
-            p = seg.pos_at(seg.t1)
-        return p
+    @staticmethod
+    def _tail_position(segments: SegmentArray, p_init: float) -> float:
+        """
+        Position at the end of the last segment. Right after truncating at t0
+        every segment ends at or before t0, so this equals the position at t0.
+        """
+        return segments.tail(p_init)
 
-    def _truncate_last_if_overlaps(self, segments: List[Segment], t_new: float) -> None:
+    def _truncate_last_if_overlaps(self, segments: SegmentArray, t_new: float) -> None:
         """
         Overwrite semantics: if the last segment extends beyond t_new, truncate it at t_new.
         """
-        if not segments:
-            return
-        last = segments[-1]
-        if t_new <= last.t0:
-            # New command earlier than last start: for simplicity, disallow / ignore by policy.
-            # (If you need out-of-order feeds, we can extend later.)
-            # Here we just truncate last to zero-length to avoid negative durations.
-            last.t1 = last.t0
-            return
-        if t_new < last.t1:
-            last.t1 = t_new  # immediate cut
+        segments.truncate(t_new)
 
-    def _append_segment(self, segments: List[Segment], t0: float, t1: float, v: float, p0_at_t0: float) -> None:
+    def _append_segment(self, segments: SegmentArray, t0: float, t1: float, v: float, p0_at_t0: float) -> None:
         """
         Append a new segment, assuming t1 >= t0.
         Zero-length segments are ignored.
         """
         if t1 <= t0:
             return
-        segments.append(Segment(t0=float(t0), t1=float(t1), v=float(v), p0=float(p0_at_t0)))
+        segments.append(t0, t1, v, p0_at_t0)
 
     # --------------------------
     # Public input API
@@ -248,37 +480,112 @@ class RailPoseEngine:
             return None
 
         self._cmd_log.append(cmd)
+        self._invalidate_pose_cache()
 
         t0 = cmd.t_rel
         dt = cmd.duration_ms / 1000.0
         t1 = t0 + dt
 
+        sgn_x, sgn_y = self._dir_sign_lut[cmd.direction_mask]
+
         # Apply to motor0 -> X axis
-        if cmd.motor_mask & 0b00000001:
-            sgn = self._dir_sign(cmd.direction_mask, 0)
-            v = sgn * float(cmd.speed_hz)
+        if cmd.motor_mask & _MOTOR_X:
+            v = sgn_x * float(cmd.speed_hz)
 
             # overwrite: truncate previous X segment at t0
             self._truncate_last_if_overlaps(self._x_segments, t0)
 
             # compute x(t0) as p0 for new segment
-            x_t0 = self.pose_x_at(t0)
+            x_t0 = self._tail_position(self._x_segments, self._x0_step)
             self._append_segment(self._x_segments, t0, t1, v, x_t0)
 
         # Apply to motor1 -> Y axis
-        if cmd.motor_mask & 0b00000010:
-            sgn = self._dir_sign(cmd.direction_mask, 1)
-            v = sgn * float(cmd.speed_hz)
+        if cmd.motor_mask & _MOTOR_Y:
+            v = sgn_y * float(cmd.speed_hz)
 
             # overwrite: truncate previous Y segment at t0
             self._truncate_last_if_overlaps(self._y_segments, t0)
 
             # compute y(t0) as p0 for new segment
-            y_t0 = self.pose_y_at(t0)
+            y_t0 = self._tail_position(self._y_segments, self._y0_step)
             self._append_segment(self._y_segments, t0, t1, v, y_t0)
 
         return cmd
 
+    def feed_bulk(self, ts, packets: bytes) -> int:
+        """
+        Feed many events at once: ts[i] is the send time of the i-th 0xBF frame
+        in packets (frames concatenated back to back).
+
+        Same result as calling feed() per event, but segments are built with a
+        few numpy passes. Falls back to feed() if the valid commands are not in
+        time order (or start before segments already in the engine).
+
+        Returns the number of valid commands.
+        """
+        size = _BF_STRUCT.size
+        ts = np.asarray(ts, dtype=np.float64)
+        if len(packets) != size * ts.size:
+            raise ValueError(f"expected {ts.size} frames of {size} bytes, got {len(packets)} bytes")
+
+        rec = np.frombuffer(packets, dtype=_BF_DTYPE)
+        valid = (rec["header"] == 0xBF) & (rec["speed_hz"] >= 0) & (rec["duration_ms"] >= 0)
+        ts_v = ts[valid]
+        rec = rec[valid]
+        if ts_v.size == 0:
+            return 0
+
+        self._ensure_time_base(ts_v[0].item())
+        t_rel = ts_v - self._t0_abs
+
+        t_last = max(
+            (segs.t0[-1] for segs in (self._x_segments, self._y_segments) if len(segs)),
+            default=-np.inf,
+        )
+        if t_rel[0] < t_last or np.any(t_rel[1:] < t_rel[:-1]):
+            for t, i in zip(ts.tolist(), range(0, len(packets), size)):
+                self.feed(t, packets[i:i + size])
+            return int(ts_v.size)
+
+        motor_mask = rec["motor_mask"]
+        direction_mask = rec["direction_mask"]
+        speed_hz = rec["speed_hz"].astype(np.int64)
+        duration_ms = rec["duration_ms"].astype(np.int64)
+
+        self._cmd_log.extend(ts_v, t_rel, motor_mask, direction_mask, speed_hz, duration_ms)
+        self._invalidate_pose_cache()
+
+        t1_all = t_rel + duration_ms / 1000.0
+        lut = np.array(self._dir_sign_lut, dtype=np.int64)
+        for bit, col, segments, p_init in (
+            (_MOTOR_X, 0, self._x_segments, self._x0_step),
+            (_MOTOR_Y, 1, self._y_segments, self._y0_step),
+        ):
+            on_axis = (motor_mask & bit) != 0
+            if not on_axis.any():
+                continue
+            t0 = t_rel[on_axis]
+            t1 = t1_all[on_axis]
+            v = lut[direction_mask[on_axis], col] * speed_hz[on_axis].astype(np.float64)
+
+            # zero-length commands are not appended, but still cut the previous segment
+            keep = t1 > t0
+            segments.truncate(t0[0].item())
+            np.minimum(t1[:-1], t0[1:], out=t1[:-1])  # overwrite: next command cuts this one
+
+            t0, t1, v = t0[keep], t1[keep], v[keep]
+            if t0.size == 0:
+                continue
+
+            # p0 of each segment = end position of the one before (sequential sum)
+            p = np.empty(t0.size + 1, dtype=np.float64)
+            p[0] = self._tail_position(segments, p_init)
+            np.multiply(v, t1 - t0, out=p[1:])
+            np.cumsum(p, out=p)
+            segments.extend(t0, t1, v, p[:-1], p[1:])
+
+        return int(ts_v.size)
+
     # --------------------------
     # Query API
     # --------------------------
@@ -293,11 +600,30 @@ class RailPoseEngine:
 
     def pose_at(self, t_rel: float) -> Tuple[float, float]:
         """(x_step, y_step) at relative time t_rel."""
-        return self.pose_x_at(t_rel), self.pose_y_at(t_rel)
+        cache = self._pose_cache
+        if cache is None:
+            return self.pose_x_at(t_rel), self.pose_y_at(t_rel)
+
+        t_rel = float(t_rel)
+        pose = cache.get(t_rel)
+        if pose is None:
+            pose = (self.pose_x_at(t_rel), self.pose_y_at(t_rel))
+            if len(cache) < _POSE_CACHE_SIZE:
+                cache[t_rel] = pose
+        return pose
+
+    def _invalidate_pose_cache(self) -> None:
+        if self._pose_cache is not None:
+            self._pose_cache.clear()
+
+    def _sample_xy(self, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized (x_step[], y_step[]) for a float64 array of relative times."""
+        return self._x_segments.pos_at(times, self._x0_step), self._y_segments.pos_at(times, self._y0_step)
 
     def sample(self, times_rel: Iterable[float]) -> List[Tuple[float, float]]:
         """Batch sample (x_step, y_step) for a list/iterable of relative times."""
-        return [self.pose_at(float(t)) for t in times_rel]
+        xs, ys = self._sample_xy(np.fromiter(times_rel, dtype=np.float64))
+        return list(zip(xs.tolist(), ys.tolist()))
 
     # --------------------------
     # Export API
@@ -326,24 +652,21 @@ class RailPoseEngine:
 
         if times_rel is None:
             # default debug sampling at all command start/end times (deduplicated, sorted)
-            ts = set()
-            for c in self._cmd_log:
-                t0 = c.t_rel
-                t1 = c.t_rel + c.duration_ms / 1000.0
-                ts.add(round(t0, 6))
-                ts.add(round(t1, 6))
-            times = sorted(ts)
+            times = sorted({round(t, 6) for t in self._command_boundaries().tolist()})
         else:
             times = [float(t) for t in times_rel]
 
-        with open(out_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["t", "x_step", "y_step", "tx_m", "ty_m", "tz_m", "qx", "qy", "qz", "qw"])
-            for t in times:
-                x_step, y_step = self.pose_at(t)
-                tx_m = x_step * self.step_x_m
-                ty_m = y_step * self.step_y_m
-                w.writerow([t, x_step, y_step, tx_m, ty_m, self.z_m, qx, qy, qz, qw])
+        xs, ys = self._sample_xy(np.asarray(times, dtype=np.float64))
+        sx = self.step_x_m
+        sy = self.step_y_m
+        suffix = f",{self.z_m},{qx},{qy},{qz},{qw}\r\n"
+
+        lines = ["t,x_step,y_step,tx_m,ty_m,tz_m,qx,qy,qz,qw\r\n"]
+        for t, x_step, y_step in zip(times, xs.tolist(), ys.tolist()):
+            lines.append(f"{t},{x_step},{y_step},{x_step * sx},{y_step * sy}{suffix}")
+
+        with open(out_path, "wb") as f:  # ASCII-only rows: encode once, no text layer
+            f.write("".join(lines).encode("ascii"))
 
     def export_ffmpeg_debug_fake_log(self, out_path: Path) -> None:
         """
@@ -379,18 +702,23 @@ class RailPoseEngine:
           {"x": [(t0,t1,v,p0), ...], "y": [...]}
         """
         return {
-            "x": [(s.t0, s.t1, s.v, s.p0) for s in self._x_segments],
-            "y": [(s.t0, s.t1, s.v, s.p0) for s in self._y_segments],
+            "x": self._x_segments.rows(),
+            "y": self._y_segments.rows(),
         }
 
     def command_log(self) -> List[BFCommand]:
         """Return a copy of parsed BF command log."""
-        return list(self._cmd_log)
+        return self._cmd_log.rows()
 
     # --------------------------
     # Adaptive sampling (non-uniform rail frames)
     # --------------------------
 
+    def _command_boundaries(self) -> np.ndarray:
+        """Start and end time of every logged command (float64, unsorted)."""
+        t0 = self._cmd_log.t_rel
+        return np.concatenate((t0, t0 + self._cmd_log.duration_ms / 1000.0))
+
     def _build_sampling_times_adaptive(
         self,
         *,
@@ -412,36 +740,26 @@ class RailPoseEngine:
         if min_dt > max_dt:
             raise ValueError("min_dt must be <= max_dt")
 
+        bounds = self._command_boundaries()
+
         # Infer t_end from command log if not provided
         if t_end is None:
-            t_end = 0.0
-            for c in self._cmd_log:
-                t_end = max(t_end, c.t_rel + c.duration_ms / 1000.0)
+            t_end = max(0.0, bounds.max().item()) if bounds.size else 0.0
 
         if t_end < t_start:
             t_end = t_start
 
-        times: set[float] = set()
-
-        # 1) Always include start & end
-        times.add(float(t_start))
-        times.add(float(t_end))
-
-        # 2) Include all command boundaries
-        for c in self._cmd_log:
-            times.add(float(c.t_rel))
-            times.add(float(c.t_rel + c.duration_ms / 1000.0))
-
-        # 3) Enforce max_dt by global stepping
-        t = float(t_start)
-        while t < float(t_end):
-            times.add(t)
-            t += float(max_dt)
+        # 1) start & end, 2) all command boundaries, 3) max_dt global stepping.
+        # The grid is a running sum (t += max_dt), so the ticks are the same
+        # floats as stepping in a loop; n has slack and is cut at t_end.
+        n = int((t_end - t_start) / max_dt) + 3
+        grid = np.full(n, float(max_dt))
+        grid[0] = t_start
+        np.cumsum(grid, out=grid)
+        grid = grid[grid < t_end]
 
         # 4) Sort and enforce min_dt (simple forward filter)
-        times_sorted = sorted(times)
-        if not times_sorted:
-            return [float(t_start)]
+        times_sorted = np.unique(np.concatenate(([t_start, t_end], bounds, grid))).tolist()
 
         filtered = [times_sorted[0]]
         for tt in times_sorted[1:]:
@@ -475,18 +793,13 @@ class RailPoseEngine:
         CSV columns:
           t, x_step,y_step, x_m,y_m, vx_step_s,vy_step_s, vx_m_s,vy_m_s
         """
-        from pathlib import Path
-        import csv
-        import math
-
         out_path = Path(out_path)
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Infer end time from commands if not provided
         if t_end is None:
-            t_end = 0.0
-            for c in self._cmd_log:
-                t_end = max(t_end, c.t_rel + c.duration_ms / 1000.0)
+            bounds = self._command_boundaries()
+            t_end = max(0.0, bounds.max().item()) if bounds.size else 0.0
 
         if dt <= 0:
             raise ValueError("dt must be positive")
@@ -494,36 +807,29 @@ class RailPoseEngine:
         if t_end < t_start:
             t_end = t_start
 
-        n = int(math.floor((t_end - t_start) / dt)) + 1
-
-        with open(out_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow([
-                "t",
-                "x_step", "y_step",
-                "x_m", "y_m",
-                "vx_step_s", "vy_step_s",
-                "vx_m_s", "vy_m_s",
-            ])
+        n = int((t_end - t_start) / dt) + 1  # quotient >= 0, so int() == floor()
 
-            prev_x, prev_y = self.pose_at(t_start)
+        ts = t_start + np.arange(n) * dt
+        xs, ys = self._sample_xy(ts)
 
-            for i in range(n):
-                t = t_start + i * dt
-                x, y = self.pose_at(t)
+        # finite-difference velocity; first row is 0 (diff against itself)
+        vxs = np.diff(xs, prepend=xs[0]) / dt
+        vys = np.diff(ys, prepend=ys[0]) / dt
 
-                vx = (x - prev_x) / dt if i > 0 else 0.0
-                vy = (y - prev_y) / dt if i > 0 else 0.0
+        sx = self.step_x_m
+        sy = self.step_y_m
 
-                w.writerow([
-                    f"{t:.6f}",
-                    f"{x:.3f}", f"{y:.3f}",
-                    f"{x * self.step_x_m:.6f}", f"{y * self.step_y_m:.6f}",
-                    f"{vx:.3f}", f"{vy:.3f}",
-                    f"{vx * self.step_x_m:.6f}", f"{vy * self.step_y_m:.6f}",
-                ])
+        # all fields are plain numbers: format rows directly and write once
+        # (\r\n keeps the line ending csv.writer produced)
+        lines = ["t,x_step,y_step,x_m,y_m,vx_step_s,vy_step_s,vx_m_s,vy_m_s\r\n"]
+        for t, x, y, vx, vy in zip(ts.tolist(), xs.tolist(), ys.tolist(), vxs.tolist(), vys.tolist()):
+            lines.append(
+                f"{t:.6f},{x:.3f},{y:.3f},{x * sx:.6f},{y * sy:.6f},"
+                f"{vx:.3f},{vy:.3f},{vx * sx:.6f},{vy * sy:.6f}\r\n"
+            )
 
-                prev_x, prev_y = x, y
+        with open(out_path, "wb") as f:  # ASCII-only rows: encode once, no text layer
+            f.write("".join(lines).encode("ascii"))
 
     # --------------------------
     # Workflow-compatible pose export (frame,time_abs,x,y,z,qx,qy,qz,qw)
@@ -551,9 +857,6 @@ class RailPoseEngine:
         - Else if min_dt/max_dt are provided: export adaptive non-uniform samples.
         - Else: export at BF command boundaries.
         """
-        from pathlib import Path
-        import csv
-
         out_path = Path(out_path)
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -568,31 +871,25 @@ class RailPoseEngine:
                 t_end=t_end,
             )
         else:
-            ts = set()
-            for c in self._cmd_log:
-                ts.add(float(c.t_rel))
-                ts.add(float(c.t_rel + c.duration_ms / 1000.0))
-            times = sorted(ts) if ts else [0.0]
+            bounds = self._command_boundaries()
+            times = np.unique(bounds).tolist() if bounds.size else [0.0]
 
         # rail-only model: fixed quaternion
         qx, qy, qz, qw = 0.0, 0.0, 0.0, 1.0
 
-        with open(out_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["frame", "time_abs", "x", "y", "z", "qx", "qy", "qz", "qw"])
-
-            for frame, t in enumerate(times):
-                x_step, y_step = self.pose_at(t)
-                x = x_step * self.step_x_m
-                y = y_step * self.step_y_m
-                z = self.z_m
-
-                w.writerow([
-                    frame,
-                    f"{t:.6f}",
-                    f"{x:.6f}", f"{y:.6f}", f"{z:.6f}",
-                    f"{qx:.6f}", f"{qy:.6f}", f"{qz:.6f}", f"{qw:.6f}",
-                ])
+        xs, ys = self._sample_xy(np.asarray(times, dtype=np.float64))
+        sx = self.step_x_m
+        sy = self.step_y_m
+        # z and the quaternion are the same on every row: format them once
+        suffix = f",{self.z_m:.6f},{qx:.6f},{qy:.6f},{qz:.6f},{qw:.6f}\r\n"
+
+        # numeric fields only: build the whole file and write it once
+        lines = ["frame,time_abs,x,y,z,qx,qy,qz,qw\r\n"]
+        for frame, (t, x_step, y_step) in enumerate(zip(times, xs.tolist(), ys.tolist())):
+            lines.append(f"{frame},{t:.6f},{x_step * sx:.6f},{y_step * sy:.6f}{suffix}")
+
+        with open(out_path, "wb") as f:  # ASCII-only rows: encode once, no text layer
+            f.write("".join(lines).encode("ascii"))
 
     # Backward-compatible wrapper (optional): keep your existing adaptive name
     def export_quat_csv_adaptive(
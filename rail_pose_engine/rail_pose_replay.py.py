@@ -10,6 +10,65 @@ from typing import Iterable, Tuple
 
 from rail_pose_engine import RailPoseEngine
 
+try:
+    import pandas as pd
+except ImportError:  # optional: C CSV parser for large logs, csv module otherwise
+    pd = None
+
+
+def _decode_packets(hex_list: list[str]) -> list[bytes]:
+    """
+    Decode all packet hex strings with a single bytes.fromhex call, then slice.
+    Falls back to per-row decoding if any row is odd-length or contains spaces.
+    """
+    if any(len(h) % 2 for h in hex_list):
+        return [bytes.fromhex(h) for h in hex_list]
+
+    blob = bytes.fromhex("".join(hex_list))
+    if 2 * len(blob) != sum(len(h) for h in hex_list):
+        return [bytes.fromhex(h) for h in hex_list]
+
+    packets = []
+    pos = 0
+    for h in hex_list:
+        end = pos + len(h) // 2
+        packets.append(blob[pos:end])
+        pos = end
+    return packets
+
+
+def _read_event_columns(path: str | Path) -> Tuple[list[float], list[str]]:
+    """Read the t_send_abs / packet_hex columns without building a dict per row."""
+    if pd is not None:
+        try:
+            df = pd.read_csv(
+                path,
+                usecols=["t_send_abs", "packet_hex"],
+                dtype={"t_send_abs": "float64", "packet_hex": str},
+                na_filter=False,
+                float_precision="round_trip",  # same values as float()
+                encoding="utf-8",
+            )
+        except pd.errors.EmptyDataError:
+            return [], []
+        return df["t_send_abs"].tolist(), df["packet_hex"].tolist()
+
+    times = []
+    hex_list = []
+    with open(path, "r", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return [], []
+        i_t = header.index("t_send_abs")
+        i_hex = header.index("packet_hex")
+        for row in reader:
+            if not row:
+                continue
+            times.append(float(row[i_t]))
+            hex_list.append(row[i_hex])
+    return times, hex_list
+
 
 def load_rail_events(path: str | Path) -> list[Tuple[float, bytes]]:
     """
@@ -18,22 +77,47 @@ def load_rail_events(path: str | Path) -> list[Tuple[float, bytes]]:
     Returns:
         List of (t_send_abs, raw_packet)
     """
-    events = []
-    with open(path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            t = float(row["t_send_abs"])
-            raw = bytes.fromhex(row["packet_hex"])
-            events.append((t, raw))
-    return events
+    times, hex_list = _read_event_columns(path)
+    return list(zip(times, _decode_packets(hex_list)))
 
 
 def replay_events(
     events: Iterable[Tuple[float, bytes]],
     engine: RailPoseEngine,
-):
+) -> int:
     """
     Feed recorded events into a RailPoseEngine.
+
+    Frames of the right size are handed to engine.feed_bulk() in one call;
+    anything else would be rejected by feed() anyway.
+
+    Returns the number of valid commands.
     """
+    size = RailPoseEngine.BF_STRUCT.size
+    times = []
+    packets = []
     for t_send_abs, raw_packet in events:
-        engine.feed(t_send_abs, raw_packet)
+        if raw_packet is not None and len(raw_packet) == size:
+            times.append(t_send_abs)
+            packets.append(raw_packet)
+    return engine.feed_bulk(times, b"".join(packets))
+
+
+def replay_rail_events(path: str | Path, engine: RailPoseEngine) -> int:
+    """
+    Load rail_events.csv straight into a RailPoseEngine.
+
+    When every row holds exactly one 0xBF frame, the packet_hex column is
+    decoded into one blob and handed to engine.feed_bulk() as is, without
+    building a bytes object per packet. Otherwise same as
+    replay_events(load_rail_events(path), engine).
+
+    Returns the number of valid commands.
+    """
+    times, hex_list = _read_event_columns(path)
+    n_hex = 2 * RailPoseEngine.BF_STRUCT.size
+    if all(len(h) == n_hex for h in hex_list):
+        blob = bytes.fromhex("".join(hex_list))
+        if 2 * len(blob) == n_hex * len(hex_list):
+            return engine.feed_bulk(times, blob)
+    return replay_events(zip(times, _decode_packets(hex_list)), engine)
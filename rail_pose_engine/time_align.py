@@ -9,7 +9,6 @@ Responsibilities:
 """
 
 from pathlib import Path
-import csv
 from typing import Iterable, List, Tuple
 
 from rail_pose_engine import RailPoseEngine
@@ -25,11 +24,8 @@ def align_times(
     Returns:
         List of (t_rel, x_step, y_step)
     """
-    aligned = []
-    for t in times_rel:
-        x, y = engine.pose_at(t)
-        aligned.append((t, x, y))
-    return aligned
+    times = list(times_rel)
+    return [(t, x, y) for t, (x, y) in zip(times, engine.sample(times))]
 
 
 def export_aligned_csv(
@@ -52,23 +48,20 @@ def export_aligned_csv(
 
     qx, qy, qz, qw = 0.0, 0.0, 0.0, 1.0
 
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow([
-            "t_rel",
-            "x_step", "y_step",
-            "x_m", "y_m",
-            "z_m",
-            "qx", "qy", "qz", "qw",
-        ])
+    times = list(times_rel)
+    poses = engine.sample(times)
 
-        for t in times_rel:
-            x_step, y_step = engine.pose_at(t)
-            w.writerow([
-                f"{t:.6f}",
-                f"{x_step:.3f}", f"{y_step:.3f}",
-                f"{x_step * engine.step_x_m:.6f}",
-                f"{y_step * engine.step_y_m:.6f}",
-                f"{engine.z_m:.6f}",
-                qx, qy, qz, qw,
-            ])
+    sx = engine.step_x_m
+    sy = engine.step_y_m
+    suffix = f",{engine.z_m:.6f},{qx},{qy},{qz},{qw}\r\n"
+
+    # numeric fields only: build the whole file and write it once
+    lines = ["t_rel,x_step,y_step,x_m,y_m,z_m,qx,qy,qz,qw\r\n"]
+    for t, (x_step, y_step) in zip(times, poses):
+        lines.append(
+            f"{t:.6f},{x_step:.3f},{y_step:.3f},"
+            f"{x_step * sx:.6f},{y_step * sy:.6f}{suffix}"
+        )
+
+    with open(out_path, "wb") as f:  # ASCII-only rows: encode once, no text layer
+        f.write("".join(lines).encode("ascii"))